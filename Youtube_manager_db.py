@@ -1,10 +1,29 @@
+import copy
+import inspect
 import sqlite3
 from datetime import datetime, timedelta
+from functools import wraps
 
 # Connect to the database
-conn = sqlite3.connect('youtube_learning.db')
+# cached_statements keeps every distinct SQL string below compiled on the connection
+conn = sqlite3.connect('youtube_learning.db', cached_statements=256)
+# Rows are accessed by column name; set before creating cursors so they inherit it
+conn.row_factory = sqlite3.Row
 cursor = conn.cursor()
 
+# WAL turns each commit into an append to the -wal file; the journal mode is
+# stored in the database file and persists across reconnects, so it is safe
+# to set on every start
+cursor.executescript('''
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=134217728;
+    PRAGMA cache_size=-20000;
+    PRAGMA busy_timeout=5000;
+    PRAGMA foreign_keys=ON;
+''')
+
 # Enhanced table structure
 cursor.execute('''
     CREATE TABLE IF NOT EXISTS videos (
@@ -30,337 +49,553 @@ cursor.execute('''
         description TEXT NOT NULL,
         timestamp TEXT,
         status TEXT DEFAULT 'pending',
-        FOREIGN KEY (video_id) REFERENCES videos (id)
+        FOREIGN KEY (video_id) REFERENCES videos (id) ON DELETE CASCADE
     )
 ''')
 
+# Older databases created tasks without ON DELETE CASCADE; rebuild the table
+# once so deleting a video removes its tasks. Tasks whose video was already
+# deleted cannot satisfy the foreign key, so they are dropped and reported
+tasks_fk = cursor.execute("PRAGMA foreign_key_list(tasks)").fetchone()
+if tasks_fk is None or tasks_fk['on_delete'] != 'CASCADE':
+    orphaned_tasks = cursor.execute('''
+        SELECT COUNT(*) FROM tasks
+        WHERE video_id IS NOT NULL AND video_id NOT IN (SELECT id FROM videos)
+    ''').fetchone()[0]
+    cursor.executescript('''
+        BEGIN;
+        CREATE TABLE tasks_new (
+            id INTEGER PRIMARY KEY,
+            video_id INTEGER,
+            description TEXT NOT NULL,
+            timestamp TEXT,
+            status TEXT DEFAULT 'pending',
+            FOREIGN KEY (video_id) REFERENCES videos (id) ON DELETE CASCADE
+        );
+        INSERT INTO tasks_new
+            SELECT * FROM tasks
+            WHERE video_id IS NULL OR video_id IN (SELECT id FROM videos);
+        DROP TABLE tasks;
+        ALTER TABLE tasks_new RENAME TO tasks;
+        COMMIT;
+    ''')
+    if orphaned_tasks:
+        print(f"Removed {orphaned_tasks} task(s) whose video no longer exists")
+
+# Indexes matching the filter and ORDER BY of the viewing functions
+cursor.executescript('''
+    CREATE INDEX IF NOT EXISTS idx_videos_status_priority_deadline ON videos (status, priority, deadline);
+    CREATE INDEX IF NOT EXISTS idx_videos_category_priority_deadline ON videos (category, priority, deadline);
+    CREATE INDEX IF NOT EXISTS idx_videos_deadline ON videos (deadline) WHERE status != 'completed';
+    CREATE INDEX IF NOT EXISTS idx_tasks_video_id ON tasks (video_id);
+''')
+
+# Full-text index over title and channel, kept in sync with videos by triggers.
+# The trigram tokenizer indexes every 3-character run, so substring searches
+# ("python" in "MicroPython", "C++", "node.js") are answered from the index
+fts_table = cursor.execute(
+    "SELECT sql FROM sqlite_master WHERE name = 'videos_fts'").fetchone()
+if fts_table is not None and 'trigram' not in fts_table['sql']:
+    # Databases created with the earlier word tokenizer get a fresh index
+    cursor.execute("DROP TABLE videos_fts")
+    fts_table = None
+cursor.executescript('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5(
+        title, channel,
+        content='videos', content_rowid='id',
+        tokenize='trigram'
+    );
+    CREATE TRIGGER IF NOT EXISTS videos_fts_insert AFTER INSERT ON videos BEGIN
+        INSERT INTO videos_fts (rowid, title, channel) VALUES (new.id, new.title, new.channel);
+    END;
+    CREATE TRIGGER IF NOT EXISTS videos_fts_delete AFTER DELETE ON videos BEGIN
+        INSERT INTO videos_fts (videos_fts, rowid, title, channel)
+        VALUES ('delete', old.id, old.title, old.channel);
+    END;
+    CREATE TRIGGER IF NOT EXISTS videos_fts_update AFTER UPDATE OF title, channel ON videos BEGIN
+        INSERT INTO videos_fts (videos_fts, rowid, title, channel)
+        VALUES ('delete', old.id, old.title, old.channel);
+        INSERT INTO videos_fts (rowid, title, channel) VALUES (new.id, new.title, new.channel);
+    END;
+''')
+if fts_table is None:
+    # Index the videos that were saved before the search table existed
+    cursor.execute("INSERT INTO videos_fts (videos_fts) VALUES ('rebuild')")
+    conn.commit()
+
+# Column projections: listings only fetch what the menu prints
+LIST_COLS = "id, title, status, priority, deadline, channel"
+DETAIL_COLS = "*"
+
+# Prepared statements, built once and reused by every helper
+_STMTS = {
+    'add_video': '''
+        INSERT INTO videos (title, url, channel, duration, category, 
+                          priority, created_date, deadline)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''',
+    'add_task': '''
+        INSERT INTO tasks (video_id, description, timestamp)
+        VALUES (?, ?, ?)
+    ''',
+    'update_video_status': "UPDATE videos SET status = ? WHERE id = ?",
+    'update_video_notes': "UPDATE videos SET notes = ? WHERE id = ?",
+    'update_task_status': "UPDATE tasks SET status = ? WHERE id = ?",
+    'record_time_spent': "UPDATE videos SET time_spent = time_spent + ? WHERE id = ?",
+    'delete_video': "DELETE FROM videos WHERE id = ?",
+    'list_videos_by_status': f"SELECT {LIST_COLS} FROM videos WHERE status = ? ORDER BY priority, deadline",
+    'list_videos': f"SELECT {LIST_COLS} FROM videos ORDER BY priority, deadline",
+    'list_videos_by_category': f"SELECT {LIST_COLS} FROM videos WHERE category = ? ORDER BY priority, deadline",
+    'get_video_tasks': "SELECT * FROM tasks WHERE video_id = ?",
+    # status != 'completed' must stay so the partial index applies
+    'get_upcoming_deadlines': '''
+        SELECT id, title, deadline FROM videos INDEXED BY idx_videos_deadline
+        WHERE deadline <= ? AND deadline IS NOT NULL AND status != 'completed'
+        ORDER BY deadline
+    ''',
+    'search_videos': f'''
+        SELECT {LIST_COLS} FROM videos
+        WHERE id IN (SELECT rowid FROM videos_fts WHERE videos_fts MATCH :p)
+        ORDER BY priority, deadline
+    ''',
+    # Terms shorter than a trigram cannot use the index; LIKE is already
+    # case-insensitive for ASCII, so no COLLATE is needed
+    'search_videos_substring': f'''
+        SELECT {LIST_COLS} FROM videos
+        WHERE title LIKE :pat OR channel LIKE :pat
+        ORDER BY priority, deadline
+    ''',
+    'learning_stats': '''
+        SELECT COUNT(*) AS total_videos,
+               COALESCE(SUM(status = 'completed'), 0) AS completed_videos,
+               COALESCE(100.0 * SUM(status = 'completed') / NULLIF(COUNT(*), 0), 0) AS completion_rate,
+               COALESCE(SUM(time_spent), 0) AS total_time_minutes,
+               COALESCE(SUM(time_spent), 0) / 60.0 AS total_time_hours,
+               (SELECT COUNT(*) FROM tasks WHERE status = 'pending') AS pending_tasks
+        FROM videos
+    ''',
+    'get_video_details': f"SELECT {DETAIL_COLS} FROM videos WHERE id = ?",
+    'validate_video_id': "SELECT 1 FROM videos WHERE id = ? LIMIT 1",
+}
+
+def _exec(key, params=()):
+    """Run a cached statement by name"""
+    return cursor.execute(_STMTS[key], params)
+
+def _stream(key, params=()):
+    """Run a cached statement on its own cursor and yield rows as they are fetched"""
+    yield from conn.execute(_STMTS[key], params)
+
+# Video ids already confirmed to exist in this session
+_valid_ids = set()
+
+# Read cache: every write clears it, and reads are only stored when no write
+# happened while they ran and no transaction is open, so uncommitted rows that
+# are later rolled back never reach it
+_CACHE = {}
+
+def _invalidate():
+    """Drop all cached reads after a write"""
+    _CACHE.clear()
+
+def _cacheable(changes):
+    """Check a finished read can be cached, given total_changes from when it started"""
+    return not conn.in_transaction and conn.total_changes == changes
+
+def _cached(fn):
+    """Cache a read function's result until the next write"""
+    signature = inspect.signature(fn)
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (fn.__name__, tuple(bound.arguments.items()))
+        if key not in _CACHE:
+            changes = conn.total_changes
+            result = fn(*bound.args, **bound.kwargs)
+            if not _cacheable(changes):
+                return result
+            _CACHE[key] = result
+        # Hand out a copy so callers cannot modify the cached value
+        return copy.copy(_CACHE[key])
+    return wrapper
+
 # Core Functions
 def add_video(title, url, channel=None, duration=None, category=None, 
-              priority=2, deadline=None):
+              priority=2, deadline=None, commit=True):
     """Add a new learning video to the database"""
     created_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    cursor.execute('''
-        INSERT INTO videos (title, url, channel, duration, category, 
-                          priority, created_date, deadline)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (title, url, channel, duration, category, priority, created_date, deadline))
-    conn.commit()
+    _exec('add_video', (title, url, channel, duration, category, priority, created_date, deadline))
+    _invalidate()
+    if commit:
+        conn.commit()
     return cursor.lastrowid
 
-def add_task(video_id, description, timestamp=None):
+def add_task(video_id, description, timestamp=None, commit=True):
     """Add a task to a specific video"""
-    cursor.execute('''
-        INSERT INTO tasks (video_id, description, timestamp)
-        VALUES (?, ?, ?)
-    ''', (video_id, description, timestamp))
-    conn.commit()
+    _exec('add_task', (video_id, description, timestamp))
+    _invalidate()
+    if commit:
+        conn.commit()
 
-def update_video_status(video_id, status):
-    """Update the status of a video"""
-    cursor.execute('''
-        UPDATE videos SET status = ? WHERE id = ?
-    ''', (status, video_id))
-    conn.commit()
+def add_tasks(tasks, commit=True):
+    """Add several (video_id, description, timestamp) tasks at once"""
+    cursor.executemany(_STMTS['add_task'], tasks)
+    _invalidate()
+    if commit:
+        conn.commit()
+
+def update_video_status(video_id, status, commit=True):
+    """Update the status of a video, returning the number of rows changed"""
+    updated = _exec('update_video_status', (status, video_id)).rowcount
+    _invalidate()
+    if commit:
+        conn.commit()
+    return updated
 
 def update_task_status(task_id, status):
     """Update the status of a task"""
-    cursor.execute('''
-        UPDATE tasks SET status = ? WHERE id = ?
-    ''', (status, task_id))
+    _exec('update_task_status', (status, task_id))
+    _invalidate()
     conn.commit()
 
 def record_time_spent(video_id, minutes):
-    """Record time spent on a video"""
-    cursor.execute('''
-        UPDATE videos SET time_spent = time_spent + ? WHERE id = ?
-    ''', (minutes, video_id))
+    """Record time spent on a video, returning the number of rows changed"""
+    updated = _exec('record_time_spent', (minutes, video_id)).rowcount
+    _invalidate()
     conn.commit()
+    return updated
 
 def delete_video(video_id):
     """Delete a video and all its tasks"""
-    cursor.execute("DELETE FROM tasks WHERE video_id = ?", (video_id,))
-    cursor.execute("DELETE FROM videos WHERE id = ?", (video_id,))
+    # Tasks are removed by ON DELETE CASCADE
+    _exec('delete_video', (video_id,))
+    _valid_ids.clear()
+    _invalidate()
     conn.commit()
 
 # Advanced Viewing Functions
 def list_videos_by_status(status=None):
     """List videos filtered by status"""
     if status:
-        cursor.execute("SELECT * FROM videos WHERE status = ? ORDER BY priority, deadline", (status,))
+        yield from _stream('list_videos_by_status', (status,))
     else:
-        cursor.execute("SELECT * FROM videos ORDER BY priority, deadline")
-    return cursor.fetchall()
+        yield from _stream('list_videos')
 
+@_cached
 def list_videos_by_category(category):
     """List videos filtered by category"""
-    cursor.execute("SELECT * FROM videos WHERE category = ? ORDER BY priority, deadline", (category,))
+    _exec('list_videos_by_category', (category,))
     return cursor.fetchall()
 
 def get_video_tasks(video_id):
     """Get all tasks for a specific video"""
-    cursor.execute("SELECT * FROM tasks WHERE video_id = ?", (video_id,))
+    _exec('get_video_tasks', (video_id,))
     return cursor.fetchall()
 
 def get_upcoming_deadlines(days=7):
     """Get videos with upcoming deadlines"""
     target_date = (datetime.now() + timedelta(days=days)).strftime("%Y-%m-%d")
-    cursor.execute('''
-        SELECT * FROM videos 
-        WHERE deadline <= ? AND status != 'completed'
-        ORDER BY deadline
-    ''', (target_date,))
-    return cursor.fetchall()
+    yield from _stream('get_upcoming_deadlines', (target_date,))
 
 def search_videos(search_term):
     """Search videos by title or channel"""
-    cursor.execute('''
-        SELECT * FROM videos 
-        WHERE title LIKE ? OR channel LIKE ?
-        ORDER BY priority, deadline
-    ''', (f'%{search_term}%', f'%{search_term}%'))
-    return cursor.fetchall()
+    words = search_term.split()
+    if not words:
+        yield from _stream('list_videos')
+        return
+    if len(search_term) < 3:
+        yield from _stream('search_videos_substring', {'pat': f'%{search_term}%'})
+        return
+    # The whole term is quoted as one phrase so it is matched as a substring
+    # and never parsed as FTS5 syntax
+    query = '"' + search_term.replace('"', '""') + '"'
+    yield from _stream('search_videos', {'p': query})
 
 # Progress Tracking Functions
+@_cached
 def get_learning_stats():
     """Get comprehensive learning statistics"""
-    # Total videos
-    cursor.execute("SELECT COUNT(*) FROM videos")
-    total = cursor.fetchone()[0]
-    
-    # Completed videos
-    cursor.execute("SELECT COUNT(*) FROM videos WHERE status = 'completed'")
-    completed = cursor.fetchone()[0]
-    
-    # Total time spent
-    cursor.execute("SELECT SUM(time_spent) FROM videos")
-    total_time = cursor.fetchone()[0] or 0
-    
-    # Pending tasks
-    cursor.execute("SELECT COUNT(*) FROM tasks WHERE status = 'pending'")
-    pending_tasks = cursor.fetchone()[0]
-    
-    return {
-        'total_videos': total,
-        'completed_videos': completed,
-        'completion_rate': (completed / total * 100) if total > 0 else 0,
-        'total_time_minutes': total_time,
-        'pending_tasks': pending_tasks
-    }
+    # One pass over videos returns every display value, named after the dict keys
+    return dict(_exec('learning_stats').fetchone())
 
 def get_video_details(video_id):
     """Get detailed information about a specific video"""
-    cursor.execute("SELECT * FROM videos WHERE id = ?", (video_id,))
+    _exec('get_video_details', (video_id,))
     return cursor.fetchone()
 
 def validate_video_id(video_id):
     """Check if a video ID exists in the database"""
     try:
         video_id = int(video_id)
-        cursor.execute("SELECT id FROM videos WHERE id = ?", (video_id,))
-        return cursor.fetchone() is not None
     except ValueError:
         return False
+    if video_id in _valid_ids:
+        return True
+    if _exec('validate_video_id', (video_id,)).fetchone() is None:
+        return False
+    _valid_ids.add(video_id)
+    return True
+
+# Priority labels indexed by the stored priority (1=High, 2=Medium, 3=Low)
+_PRIORITY = ("?", "High", "Medium", "Low")
+
+# Listing lines written per print call
+_LIST_BATCH = 200
 
 # Enhanced Main Application
+_MENU = """
+==================================================
+YouTube Learning Manager
+==================================================
+1. Add New Learning Video
+2. List Videos
+3. Update Video Status
+4. Add Task to Video
+5. View Video Details & Tasks
+6. View Upcoming Deadlines
+7. View Learning Statistics
+8. Search Videos
+9. Record Time Spent
+10. Delete Video
+11. Exit
+--------------------------------------------------"""
+
+def _handle_add():
+    """Add a new video, its notes and tasks"""
+    print("\n--- Add New Learning Video ---")
+    title = input("Enter video title: ")
+    url = input("Enter video URL: ")
+    channel = input("Enter channel name (optional): ")
+    duration = input("Enter duration (optional): ")
+    category = input("Enter category (optional): ")
+    priority = input("Enter priority (1=High, 2=Medium, 3=Low) [2]: ") or "2"
+    deadline = input("Enter deadline (YYYY-MM-DD, optional): ")
+    notes = input("Enter notes (optional): ")
+    try:
+        priority = int(priority)
+    except ValueError as e:
+        print(f"❌ Error adding video: {e}")
+        return
+    
+    # Ask if user wants to add tasks; they are saved together with the video
+    tasks_buf = []
+    while input("\nAdd a task for this video? (y/n): ").lower() == 'y':
+        task_desc = input("Task description: ")
+        timestamp = input("Timestamp (optional, format HH:MM:SS): ")
+        tasks_buf.append((task_desc, timestamp))
+    
+    try:
+        # Video, notes and tasks are saved in one short transaction, opened
+        # only after all prompts so no write lock is held while waiting on input
+        with conn:
+            video_id = add_video(title, url, channel, duration, category, priority, deadline,
+                                 commit=False)
+            if notes:
+                _exec('update_video_notes', (notes, video_id))
+                _invalidate()
+            add_tasks([(video_id, desc, ts) for desc, ts in tasks_buf], commit=False)
+        print(f"✅ Video added successfully with ID: {video_id}")
+        if tasks_buf:
+            print(f"✅ {len(tasks_buf)} task(s) added!")
+    except Exception as e:
+        print(f"❌ Error adding video: {e}")
+
+def _handle_list():
+    """List videos, optionally filtered by status"""
+    print("\n--- List Videos ---")
+    status_filter = input("Filter by status (pending, in-progress, completed, or leave empty for all): ")
+    videos = list_videos_by_status(status_filter if status_filter else None)
+    
+    # Write the listing in batches: few print calls, without holding every
+    # line of a long listing in memory
+    count = 0
+    lines = ["\n" + "-" * 80]
+    for video in videos:
+        count += 1
+        deadline = video['deadline'] or 'None'
+        lines.append(f"ID: {video['id']} | {video['title']} | Status: {video['status']} | Priority: {_PRIORITY[video['priority']]} | Deadline: {deadline}")
+        if len(lines) >= _LIST_BATCH:
+            print("\n".join(lines))
+            lines = []
+    if count:
+        lines.append("-" * 80)
+        lines.append(f"Found {count} video(s).")
+        print("\n".join(lines))
+    else:
+        print("No videos found.")
+
+def _handle_update_status():
+    """Update the status of a video"""
+    print("\n--- Update Video Status ---")
+    video_id = input("Enter video ID to update: ")
+    new_status = input("Enter new status (pending, in-progress, completed): ")
+    try:
+        if not update_video_status(video_id, new_status):
+            print("❌ Invalid video ID!")
+            return
+        print("✅ Status updated successfully!")
+    except Exception as e:
+        print(f"❌ Error updating status: {e}")
+
+def _handle_add_task():
+    """Add a task to an existing video"""
+    print("\n--- Add Task to Video ---")
+    video_id = input("Enter video ID to add task: ")
+    task_desc = input("Task description: ")
+    timestamp = input("Timestamp (optional, format HH:MM:SS): ")
+    try:
+        # The tasks foreign key rejects ids with no matching video
+        add_task(video_id, task_desc, timestamp)
+        print("✅ Task added successfully!")
+    except sqlite3.IntegrityError:
+        conn.rollback()
+        print("❌ Invalid video ID!")
+    except Exception as e:
+        print(f"❌ Error adding task: {e}")
+
+def _handle_details():
+    """Show a video with all its tasks"""
+    print("\n--- View Video Details & Tasks ---")
+    video_id = input("Enter video ID to view details: ")
+    video = get_video_details(video_id)
+    
+    if video:
+        print(f"\n📹 Video Details:")
+        print(f"Title: {video['title']}")
+        print(f"URL: {video['url']}")
+        print(f"Channel: {video['channel'] or 'Not specified'}")
+        print(f"Duration: {video['duration'] or 'Not specified'}")
+        print(f"Category: {video['category'] or 'Not specified'}")
+        print(f"Priority: {_PRIORITY[video['priority']]}")
+        print(f"Status: {video['status']}")
+        print(f"Time spent: {video['time_spent']} minutes")
+        print(f"Created: {video['created_date']}")
+        print(f"Deadline: {video['deadline'] or 'No deadline'}")
+        print(f"Notes: {video['notes'] or 'No notes'}")
+    
+        # Show tasks
+        tasks = get_video_tasks(video_id)
+        if tasks:
+            print(f"\n📋 Tasks ({len(tasks)}):")
+            for task in tasks:
+                at = f"at {task['timestamp']}" if task['timestamp'] else ''
+                print(f"  • {task['description']} [Status: {task['status']}] {at}")
+        else:
+            print("\n📋 No tasks for this video.")
+    else:
+        print("❌ Video not found!")
+
+def _handle_deadlines():
+    """Show videos with upcoming deadlines"""
+    print("\n--- Upcoming Deadlines ---")
+    days = input("Show deadlines within how many days? [7]: ") or "7"
+    try:
+        found = False
+        for video in get_upcoming_deadlines(int(days)):
+            if not found:
+                print(f"\nVideos with deadlines in the next {days} days:")
+                print("-" * 60)
+                found = True
+            print(f"ID: {video['id']} | {video['title']} | Deadline: {video['deadline']}")
+        if not found:
+            print(f"No videos with deadlines in the next {days} days.")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
+def _handle_stats():
+    """Show learning statistics"""
+    print("\n--- Learning Statistics ---")
+    stats = get_learning_stats()
+    print(f"📊 Your Learning Progress:")
+    print(f"Total videos: {stats['total_videos']}")
+    print(f"Completed videos: {stats['completed_videos']}")
+    print(f"Completion rate: {stats['completion_rate']:.1f}%")
+    print(f"Total time spent: {stats['total_time_minutes']} minutes ({stats['total_time_hours']:.1f} hours)")
+    print(f"Pending tasks: {stats['pending_tasks']}")
+
+def _handle_search():
+    """Search videos by title or channel"""
+    print("\n--- Search Videos ---")
+    search_term = input("Enter search term (title or channel): ")
+    videos = search_videos(search_term)
+    count = 0
+    for video in videos:
+        if not count:
+            print("\n" + "-" * 80)
+        count += 1
+        channel = video['channel'] or 'Unknown'
+        print(f"ID: {video['id']} | {video['title']} | Channel: {channel} | Status: {video['status']} | Priority: {_PRIORITY[video['priority']]}")
+    if count:
+        print("-" * 80)
+        print(f"Found {count} video(s) matching '{search_term}'.")
+    else:
+        print(f"No videos found matching '{search_term}'.")
+
+def _handle_record_time():
+    """Record time spent on a video"""
+    print("\n--- Record Time Spent ---")
+    video_id = input("Enter video ID: ")
+    minutes = input("Enter minutes spent: ")
+    try:
+        if not record_time_spent(video_id, int(minutes)):
+            print("❌ Invalid video ID!")
+            return
+        print("✅ Time recorded successfully!")
+    except Exception as e:
+        print(f"❌ Error recording time: {e}")
+
+def _handle_delete():
+    """Delete a video after confirmation"""
+    print("\n--- Delete Video ---")
+    video_id = input("Enter video ID to delete: ")
+    if not validate_video_id(video_id):
+        print("❌ Invalid video ID!")
+        return
+    confirm = input("Are you sure? This will delete the video and all its tasks! (y/n): ")
+    if confirm.lower() == 'y':
+        try:
+            delete_video(video_id)
+            print("✅ Video deleted successfully!")
+        except Exception as e:
+            print(f"❌ Error deleting video: {e}")
+    else:
+        print("Deletion cancelled.")
+
+def _handle_exit():
+    """Close the database and stop the menu loop"""
+    print("\nThank you for using YouTube Learning Manager!")
+    print("Keep learning and growing! 🚀")
+    conn.close()
+    return True
+
+# Menu choices mapped to their handlers; a handler returning True ends the loop
+_HANDLERS = {
+    '1': _handle_add,
+    '2': _handle_list,
+    '3': _handle_update_status,
+    '4': _handle_add_task,
+    '5': _handle_details,
+    '6': _handle_deadlines,
+    '7': _handle_stats,
+    '8': _handle_search,
+    '9': _handle_record_time,
+    '10': _handle_delete,
+    '11': _handle_exit,
+}
+
 def main():
     print("Welcome to YouTube Learning Manager!")
     print("Your personal learning companion for YouTube videos")
     
     while True:
-        print("\n" + "="*50)
-        print("YouTube Learning Manager")
-        print("="*50)
-        print("1. Add New Learning Video")
-        print("2. List Videos")
-        print("3. Update Video Status")
-        print("4. Add Task to Video")
-        print("5. View Video Details & Tasks")
-        print("6. View Upcoming Deadlines")
-        print("7. View Learning Statistics")
-        print("8. Search Videos")
-        print("9. Record Time Spent")
-        print("10. Delete Video")
-        print("11. Exit")
-        print("-"*50)
-        
-        choice = input("Enter your choice (1-11): ")
-        
-        if choice == '1':
-            print("\n--- Add New Learning Video ---")
-            title = input("Enter video title: ")
-            url = input("Enter video URL: ")
-            channel = input("Enter channel name (optional): ")
-            duration = input("Enter duration (optional): ")
-            category = input("Enter category (optional): ")
-            priority = input("Enter priority (1=High, 2=Medium, 3=Low) [2]: ") or "2"
-            deadline = input("Enter deadline (YYYY-MM-DD, optional): ")
-            notes = input("Enter notes (optional): ")
-            
-            try:
-                video_id = add_video(title, url, channel, duration, category, int(priority), deadline)
-                if notes:
-                    cursor.execute("UPDATE videos SET notes = ? WHERE id = ?", (notes, video_id))
-                    conn.commit()
-                print(f"✅ Video added successfully with ID: {video_id}")
-                
-                # Ask if user wants to add tasks
-                while input("\nAdd a task for this video? (y/n): ").lower() == 'y':
-                    task_desc = input("Task description: ")
-                    timestamp = input("Timestamp (optional, format HH:MM:SS): ")
-                    add_task(video_id, task_desc, timestamp)
-                    print("✅ Task added!")
-            except Exception as e:
-                print(f"❌ Error adding video: {e}")
-                
-        elif choice == '2':
-            print("\n--- List Videos ---")
-            status_filter = input("Filter by status (pending, in-progress, completed, or leave empty for all): ")
-            videos = list_videos_by_status(status_filter if status_filter else None)
-            
-            if videos:
-                print(f"\nFound {len(videos)} video(s):")
-                print("-" * 80)
-                for video in videos:
-                    priority_text = {1: "High", 2: "Medium", 3: "Low"}[video[6]]
-                    print(f"ID: {video[0]} | {video[1]} | Status: {video[7]} | Priority: {priority_text} | Deadline: {video[10] or 'None'}")
-            else:
-                print("No videos found.")
-                
-        elif choice == '3':
-            print("\n--- Update Video Status ---")
-            video_id = input("Enter video ID to update: ")
-            if not validate_video_id(video_id):
-                print("❌ Invalid video ID!")
-                continue
-            new_status = input("Enter new status (pending, in-progress, completed): ")
-            try:
-                update_video_status(video_id, new_status)
-                print("✅ Status updated successfully!")
-            except Exception as e:
-                print(f"❌ Error updating status: {e}")
-                
-        elif choice == '4':
-            print("\n--- Add Task to Video ---")
-            video_id = input("Enter video ID to add task: ")
-            if not validate_video_id(video_id):
-                print("❌ Invalid video ID!")
-                continue
-            task_desc = input("Task description: ")
-            timestamp = input("Timestamp (optional, format HH:MM:SS): ")
-            try:
-                add_task(video_id, task_desc, timestamp)
-                print("✅ Task added successfully!")
-            except Exception as e:
-                print(f"❌ Error adding task: {e}")
-                
-        elif choice == '5':
-            print("\n--- View Video Details & Tasks ---")
-            video_id = input("Enter video ID to view details: ")
-            if not validate_video_id(video_id):
-                print("❌ Invalid video ID!")
-                continue
-            video = get_video_details(video_id)
-            
-            if video:
-                print(f"\n📹 Video Details:")
-                print(f"Title: {video[1]}")
-                print(f"URL: {video[2]}")
-                print(f"Channel: {video[3] or 'Not specified'}")
-                print(f"Duration: {video[4] or 'Not specified'}")
-                print(f"Category: {video[5] or 'Not specified'}")
-                print(f"Priority: {['High', 'Medium', 'Low'][video[6]-1]}")
-                print(f"Status: {video[7]}")
-                print(f"Time spent: {video[11]} minutes")
-                print(f"Created: {video[9]}")
-                print(f"Deadline: {video[10] or 'No deadline'}")
-                print(f"Notes: {video[8] or 'No notes'}")
-                
-                # Show tasks
-                tasks = get_video_tasks(video_id)
-                if tasks:
-                    print(f"\n📋 Tasks ({len(tasks)}):")
-                    for task in tasks:
-                        print(f"  • {task[2]} [Status: {task[4]}] {f'at {task[3]}' if task[3] else ''}")
-                else:
-                    print("\n📋 No tasks for this video.")
-            else:
-                print("❌ Video not found!")
-                
-        elif choice == '6':
-            print("\n--- Upcoming Deadlines ---")
-            days = input("Show deadlines within how many days? [7]: ") or "7"
-            try:
-                videos = get_upcoming_deadlines(int(days))
-                if videos:
-                    print(f"\nVideos with deadlines in the next {days} days:")
-                    print("-" * 60)
-                    for video in videos:
-                        print(f"ID: {video[0]} | {video[1]} | Deadline: {video[10]}")
-                else:
-                    print(f"No videos with deadlines in the next {days} days.")
-            except Exception as e:
-                print(f"❌ Error: {e}")
-                
-        elif choice == '7':
-            print("\n--- Learning Statistics ---")
-            stats = get_learning_stats()
-            print(f"📊 Your Learning Progress:")
-            print(f"Total videos: {stats['total_videos']}")
-            print(f"Completed videos: {stats['completed_videos']}")
-            print(f"Completion rate: {stats['completion_rate']:.1f}%")
-            print(f"Total time spent: {stats['total_time_minutes']} minutes ({stats['total_time_minutes']/60:.1f} hours)")
-            print(f"Pending tasks: {stats['pending_tasks']}")
-            
-        elif choice == '8':
-            print("\n--- Search Videos ---")
-            search_term = input("Enter search term (title or channel): ")
-            videos = search_videos(search_term)
-            if videos:
-                print(f"\nFound {len(videos)} video(s) matching '{search_term}':")
-                print("-" * 80)
-                for video in videos:
-                    priority_text = {1: "High", 2: "Medium", 3: "Low"}[video[6]]
-                    print(f"ID: {video[0]} | {video[1]} | Channel: {video[3] or 'Unknown'} | Status: {video[7]} | Priority: {priority_text}")
-            else:
-                print(f"No videos found matching '{search_term}'.")
-                
-        elif choice == '9':
-            print("\n--- Record Time Spent ---")
-            video_id = input("Enter video ID: ")
-            if not validate_video_id(video_id):
-                print("❌ Invalid video ID!")
-                continue
-            minutes = input("Enter minutes spent: ")
-            try:
-                record_time_spent(video_id, int(minutes))
-                print("✅ Time recorded successfully!")
-            except Exception as e:
-                print(f"❌ Error recording time: {e}")
-                
-        elif choice == '10':
-            print("\n--- Delete Video ---")
-            video_id = input("Enter video ID to delete: ")
-            if not validate_video_id(video_id):
-                print("❌ Invalid video ID!")
-                continue
-            confirm = input("Are you sure? This will delete the video and all its tasks! (y/n): ")
-            if confirm.lower() == 'y':
-                try:
-                    delete_video(video_id)
-                    print("✅ Video deleted successfully!")
-                except Exception as e:
-                    print(f"❌ Error deleting video: {e}")
-            else:
-                print("Deletion cancelled.")
-                
-        elif choice == '11':
-            print("\nThank you for using YouTube Learning Manager!")
-            print("Keep learning and growing! 🚀")
-            conn.close()
-            break
-            
-        else:
+        print(_MENU)
+        handler = _HANDLERS.get(input("Enter your choice (1-11): "))
+        if handler is None:
             print("❌ Invalid choice! Please enter a number between 1-11.")
+        elif handler():
+            break
 
 if __name__ == "__main__":
     try:
@@ -4,15 +4,68 @@ Test script for YouTube Learning Manager
 This script tests all the main functions to ensure they work correctly
 """
 
+import builtins
+import os
 import sqlite3
+import sys
+import tempfile
 from datetime import datetime, timedelta
 
+# Throwaway directory holding the database the manager module opens
+_TEST_DIR = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+
+def create_legacy_database(path):
+    """Create a database with the original schema, one valid task and one orphaned task"""
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE videos (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            url TEXT NOT NULL,
+            channel TEXT,
+            duration TEXT,
+            category TEXT,
+            priority INTEGER DEFAULT 2,
+            status TEXT DEFAULT 'pending',
+            notes TEXT,
+            created_date TEXT NOT NULL,
+            deadline TEXT,
+            time_spent INTEGER DEFAULT 0
+        );
+        CREATE TABLE tasks (
+            id INTEGER PRIMARY KEY,
+            video_id INTEGER,
+            description TEXT NOT NULL,
+            timestamp TEXT,
+            status TEXT DEFAULT 'pending',
+            FOREIGN KEY (video_id) REFERENCES videos (id)
+        );
+        INSERT INTO videos (id, title, url, channel, created_date)
+            VALUES (1, 'Legacy Video', 'https://youtube.com/legacy', 'Legacy Channel', '2024-01-01 00:00:00');
+        INSERT INTO tasks (id, video_id, description) VALUES (1, 1, 'Legacy task');
+        INSERT INTO tasks (id, video_id, description) VALUES (2, 42, 'Orphaned task');
+    ''')
+    conn.commit()
+    conn.close()
+
+def load_manager():
+    """Import the manager module against a legacy database in the throwaway directory"""
+    if 'Youtube_manager_db' not in sys.modules:
+        create_legacy_database(os.path.join(_TEST_DIR.name, 'youtube_learning.db'))
+        cwd = os.getcwd()
+        os.chdir(_TEST_DIR.name)
+        try:
+            import Youtube_manager_db
+        finally:
+            os.chdir(cwd)
+    return sys.modules['Youtube_manager_db']
+
 def test_database_creation():
     """Test if database and tables are created correctly"""
     print("Testing database creation...")
     
-    # Connect to test database
-    conn = sqlite3.connect('test_youtube_learning.db')
+    # Connect to an in-memory test database; it disappears on close()
+    conn = sqlite3.connect(':memory:')
     cursor = conn.cursor()
     
     # Create tables
@@ -40,7 +93,7 @@ def test_database_creation():
             description TEXT NOT NULL,
             timestamp TEXT,
             status TEXT DEFAULT 'pending',
-            FOREIGN KEY (video_id) REFERENCES videos (id)
+            FOREIGN KEY (video_id) REFERENCES videos (id) ON DELETE CASCADE
         )
     ''')
     
@@ -57,6 +110,15 @@ def test_database_creation():
     video_id = cursor.lastrowid
     print(f"✅ Test video added with ID: {video_id}")
     
+    # Add a few more videos to verify in one query
+    video_ids = [video_id]
+    for i in range(2, 4):
+        cursor.execute('''
+            INSERT INTO videos (title, url, created_date)
+            VALUES (?, ?, ?)
+        ''', (f"Test Video {i}", f"https://youtube.com/test{i}", created_date))
+        video_ids.append(cursor.lastrowid)
+    
     # Test adding a task
     cursor.execute('''
         INSERT INTO tasks (video_id, description, timestamp)
@@ -85,8 +147,15 @@ def test_database_creation():
         print(f"   - Deadline: {video[10]}")
         print(f"   - Time Spent: {video[11]}")
     
+    # Verify every inserted video with a single IN-list query
+    placeholders = ", ".join("?" * len(video_ids))
+    cursor.execute(f"SELECT id, title, status FROM videos WHERE id IN ({placeholders})", video_ids)
+    rows = cursor.fetchall()
+    assert sorted(row[0] for row in rows) == sorted(video_ids)
+    print(f"✅ Verified {len(rows)} video(s) in one query")
+    
     # Test task retrieval
-    cursor.execute("SELECT * FROM tasks WHERE video_id = ?", (video_id,))
+    cursor.execute(f"SELECT * FROM tasks WHERE video_id IN ({placeholders})", video_ids)
     tasks = cursor.fetchall()
     
     if tasks:
@@ -101,10 +170,6 @@ def test_database_creation():
     
     print(f"✅ Statistics: {total} total videos, {completed} completed")
     
-    # Clean up
-    cursor.execute("DELETE FROM tasks WHERE video_id = ?", (video_id,))
-    cursor.execute("DELETE FROM videos WHERE id = ?", (video_id,))
-    conn.commit()
     conn.close()
     
     print("✅ All tests passed! Database is working correctly.")
@@ -116,7 +181,7 @@ def test_main_functions():
     
     try:
         # Import the main module
-        import Youtube_manager_db
+        Youtube_manager_db = load_manager()
         
         # Test database connection
         print("✅ Database connection successful")
@@ -160,7 +225,7 @@ def test_main_functions():
         print(f"✅ Statistics: {stats['total_videos']} videos, {stats['completion_rate']:.1f}% complete")
         
         # Test search
-        search_results = Youtube_manager_db.search_videos("Test")
+        search_results = list(Youtube_manager_db.search_videos("Test"))
         if search_results:
             print(f"✅ Search working: Found {len(search_results)} result(s)")
         
@@ -179,6 +244,131 @@ def test_main_functions():
         print(f"❌ Error testing main functions: {e}")
         return False
 
+def test_legacy_migration():
+    """Test that an old tasks table is rebuilt with ON DELETE CASCADE"""
+    print("\nTesting legacy database migration...")
+    manager = load_manager()
+    
+    foreign_key = manager.cursor.execute("PRAGMA foreign_key_list(tasks)").fetchone()
+    assert foreign_key['on_delete'] == 'CASCADE'
+    
+    tasks = manager.cursor.execute("SELECT id, description FROM tasks ORDER BY id").fetchall()
+    assert [tuple(task) for task in tasks] == [(1, 'Legacy task')]
+    print("✅ Valid tasks kept, orphaned task removed")
+    
+    assert [video['title'] for video in manager.search_videos("legacy")] == ['Legacy Video']
+    print("✅ Existing videos indexed for search")
+    return True
+
+def test_delete_cascade():
+    """Test that deleting a video removes its tasks"""
+    print("\nTesting delete cascade...")
+    manager = load_manager()
+    
+    video_id = manager.add_video("Cascade Video", "https://youtube.com/cascade")
+    manager.add_task(video_id, "First task")
+    manager.add_task(video_id, "Second task")
+    assert len(manager.get_video_tasks(video_id)) == 2
+    
+    manager.delete_video(video_id)
+    remaining = manager.cursor.execute("SELECT COUNT(*) FROM tasks WHERE video_id = ?", (video_id,)).fetchone()[0]
+    assert remaining == 0
+    print("✅ Tasks deleted together with their video")
+    return True
+
+def test_add_tasks_batch():
+    """Test batched task inserts and the add-video wizard transaction"""
+    print("\nTesting batched task entry...")
+    manager = load_manager()
+    
+    video_id = manager.add_video("Batch Video", "https://youtube.com/batch")
+    manager.add_tasks([(video_id, "a", ""), (video_id, "b", "")])
+    assert [task['description'] for task in manager.get_video_tasks(video_id)] == ["a", "b"]
+    print("✅ Batch of tasks added")
+    
+    try:
+        with manager.conn:
+            manager.add_tasks([(video_id, "c", ""), (999999, "bad video", "")], commit=False)
+    except sqlite3.IntegrityError:
+        pass
+    assert [task['description'] for task in manager.get_video_tasks(video_id)] == ["a", "b"]
+    print("✅ Batch with an invalid video ID rolled back")
+    
+    # Drive the wizard with scripted answers: video fields, then two tasks
+    answers = iter(["Wizard Video", "https://youtube.com/wizard", "", "", "", "1", "", "Wizard notes",
+                    "y", "first", "00:10", "y", "second", "", "n"])
+    original_input = builtins.input
+    builtins.input = lambda prompt="": next(answers)
+    try:
+        manager._handle_add()
+    finally:
+        builtins.input = original_input
+    assert not manager.conn.in_transaction
+    video = manager.conn.execute("SELECT id, notes FROM videos WHERE title = 'Wizard Video'").fetchone()
+    assert video['notes'] == "Wizard notes"
+    assert [task['description'] for task in manager.get_video_tasks(video['id'])] == ["first", "second"]
+    print("✅ Wizard saved video, notes and tasks together")
+    return True
+
+def test_search_sync():
+    """Test that the search index follows title updates and deletes"""
+    print("\nTesting search index sync...")
+    manager = load_manager()
+    search = manager.search_videos
+    
+    video_id = manager.add_video("Quantum Widgets", "https://youtube.com/quantum", "Physics Channel")
+    assert [video['id'] for video in search("quantum")] == [video_id]
+    
+    manager.cursor.execute("UPDATE videos SET title = ? WHERE id = ?", ("Classical Gadgets", video_id))
+    manager.conn.commit()
+    assert list(search("quantum")) == []
+    assert [video['id'] for video in search("gadget")] == [video_id]
+    print("✅ Title update reflected in search")
+    
+    manager.delete_video(video_id)
+    assert list(search("gadget")) == []
+    print("✅ Deleted video removed from search")
+    
+    manager.add_video("C# in depth", "https://youtube.com/csharp")
+    manager.add_video("Cooking show", "https://youtube.com/cooking")
+    assert [video['title'] for video in search("C#")] == ["C# in depth"]
+    manager.add_video("Python basics", "https://youtube.com/python")
+    manager.add_video("MicroPython intro", "https://youtube.com/micropython")
+    assert sorted(video['title'] for video in search("python")) == ["MicroPython intro", "Python basics"]
+    print("✅ Punctuated and in-word search terms matched")
+    return True
+
+def test_cache_invalidation():
+    """Test that cached reads are refreshed by writes and never hold rolled-back rows"""
+    print("\nTesting read cache...")
+    manager = load_manager()
+    
+    stats = manager.get_learning_stats()
+    total = stats['total_videos']
+    stats['total_videos'] = 999
+    assert manager.get_learning_stats()['total_videos'] != 999
+    print("✅ Cached results are copies")
+    
+    before = len(manager.list_videos_by_category(category="Caching"))
+    assert len(manager.list_videos_by_category("Caching")) == before
+    manager.add_video("Cache Video", "https://youtube.com/cache", category="Caching")
+    assert len(manager.list_videos_by_category(category="Caching")) == before + 1
+    assert manager.get_learning_stats()['total_videos'] == total + 1
+    print("✅ Writes invalidate cached reads")
+    
+    try:
+        with manager.conn:
+            manager.add_video("Rolled Back", "https://youtube.com/rollback", category="Caching", commit=False)
+            assert len(manager.list_videos_by_category("Caching")) == before + 2
+            assert manager.get_learning_stats()['total_videos'] == total + 2
+            raise RuntimeError("rollback")
+    except RuntimeError:
+        pass
+    assert len(manager.list_videos_by_category("Caching")) == before + 1
+    assert manager.get_learning_stats()['total_videos'] == total + 1
+    print("✅ Rolled-back rows are not cached")
+    return True
+
 if __name__ == "__main__":
     print("🧪 YouTube Learning Manager - Test Suite")
     print("=" * 50)
@@ -187,8 +377,10 @@ if __name__ == "__main__":
     if test_database_creation():
         print("\n" + "=" * 50)
         
-        # Test main functions
-        if test_main_functions():
+        # Test main functions and the database features behind them
+        tests = [test_main_functions, test_legacy_migration, test_delete_cascade,
+                 test_add_tasks_batch, test_search_sync, test_cache_invalidation]
+        if all(test() for test in tests):
             print("\n🎉 ALL TESTS PASSED! The YouTube Learning Manager is working perfectly!")
             print("\nYou can now run: python Youtube_manager_db.py")
         else: